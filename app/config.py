@@ -1,4 +1,7 @@
 import json
+import logging
+from functools import cached_property
+
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -9,6 +12,12 @@ class Settings(BaseSettings):
     # App settings
     app_name: str = "prowlarr-llm-proxy"
     debug: bool = False
+    log_level: str = Field(
+        default="INFO", description="Minimum log level (DEBUG=true forces DEBUG)"
+    )
+    log_sample_rate: float = Field(
+        default=1.0, description="Fraction of requests whose payloads are logged at DEBUG"
+    )
 
     # Routes: JSON mapping of port -> upstream URL
     # Example: {"8585": "http://sonarr:8989", "8586": "http://prowlarr:9696"}
@@ -23,12 +32,27 @@ class Settings(BaseSettings):
 
     # Proxy settings
     proxy_timeout: float = Field(default=60.0, description="Proxy request timeout in seconds")
+    proxy_max_connections: int = Field(default=200, description="Max upstream connections")
+    proxy_max_keepalive: int = Field(
+        default=100, description="Max idle keep-alive upstream connections"
+    )
+    proxy_keepalive_expiry: float = Field(
+        default=60.0, description="Idle upstream connection lifetime in seconds"
+    )
 
     # OpenAI settings
     openai_api_key: str = Field(default="", description="OpenAI API key")
     openai_model: str = Field(default="gpt-4o-mini", description="OpenAI model to use")
     llm_enabled: bool = Field(default=True, description="Enable LLM title parsing")
     max_llm_titles: int = Field(default=50, description="Max titles to process through LLM (0 = unlimited)")
+    llm_cache_size: int = Field(
+        default=10_000, description="Max parsed titles kept in memory cache"
+    )
+    llm_max_concurrency: int = Field(default=50, description="Max concurrent LLM requests")
+    llm_cache_dir: str = Field(
+        default="/var/cache/prowlarr-llm",
+        description="Directory for persistent title cache (empty = disabled)",
+    )
 
     model_config = {
         "env_file": ".env",
@@ -36,7 +60,19 @@ class Settings(BaseSettings):
         "extra": "ignore",
     }
 
-    def get_routes(self) -> dict[int, str]:
+    @property
+    def min_log_level(self) -> int:
+        """Numeric minimum log level; unknown names fall back to INFO."""
+        if self.debug:
+            return logging.DEBUG
+        return logging.getLevelNamesMapping().get(self.log_level.upper(), logging.INFO)
+
+    @cached_property
+    def routes_map(self) -> dict[int, str]:
+        """Routes as dict of port -> upstream URL, parsed once."""
+        return self._parse_routes()
+
+    def _parse_routes(self) -> dict[int, str]:
         """Parse routes JSON into dict of port -> upstream URL."""
         try:
             routes = json.loads(self.routes)
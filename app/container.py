@@ -1,6 +1,6 @@
 from dependency_injector import containers, providers
 
-from app.config import Settings
+from app.config import settings
 from app.services.llm import LLMService
 from app.services.proxy import ProxyService
 
@@ -8,29 +8,31 @@ from app.services.proxy import ProxyService
 class Container(containers.DeclarativeContainer):
     """Dependency injection container."""
 
-    wiring_config = containers.WiringConfiguration(
-        modules=[
-            "app.controllers.proxy",
-        ]
-    )
-
-    # Configuration
-    config = providers.Singleton(Settings)
+    # Configuration (reuse the module-level instance so env/.env is parsed once)
+    config = providers.Object(settings)
 
     # LLM Service (optional - only created if API key is provided)
     llm_service = providers.Singleton(
         LLMService,
         api_key=config.provided.openai_api_key,
         model=config.provided.openai_model,
+        cache_size=config.provided.llm_cache_size,
+        cache_dir=config.provided.llm_cache_dir,
+        max_concurrency=config.provided.llm_max_concurrency,
     )
 
     # Proxy Service
     proxy_service = providers.Singleton(
         ProxyService,
-        routes=config.provided.get_routes.call(),
+        routes=config.provided.routes_map,
         timeout=config.provided.proxy_timeout,
+        max_connections=config.provided.proxy_max_connections,
+        max_keepalive=config.provided.proxy_max_keepalive,
+        keepalive_expiry=config.provided.proxy_keepalive_expiry,
         llm_service=llm_service,
         llm_enabled=config.provided.llm_enabled,
+        log_level=config.provided.min_log_level,
+        log_sample_rate=config.provided.log_sample_rate,
     )
 
 
@@ -38,3 +40,6 @@ async def shutdown_services(container: Container) -> None:
     """Cleanup services on shutdown."""
     proxy_service: ProxyService = container.proxy_service()
     await proxy_service.close()
+
+    llm_service: LLMService = container.llm_service()
+    await llm_service.close()
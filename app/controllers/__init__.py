@@ -1,6 +1,6 @@
-from app.controllers.proxy import router as proxy_router
+from app.controllers.proxy import proxy_all, PROXY_METHODS
 from app.controllers.health import router as health_router
 
-__all__ = ["proxy_router", "health_router"]
+__all__ = ["proxy_all", "PROXY_METHODS", "health_router"]
 
 
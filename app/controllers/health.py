@@ -1,28 +1,37 @@
 from fastapi import APIRouter
+from fastapi.responses import Response
 from pydantic import BaseModel
 
 router = APIRouter(tags=["Health"])
 
 
 class HealthResponse(BaseModel):
-    """Health check response."""
+    """Health check response (documents the schema; bodies are pre-encoded)."""
 
     status: str
 
 
+# Probes are hit constantly - return pre-encoded bodies and skip serialization.
+# FastAPI passes Response instances through untouched, so response_model
+# only affects the OpenAPI schema.
+_HEALTHY = Response(content=b'{"status":"healthy"}', media_type="application/json")
+_LIVE = Response(content=b'{"status":"ok"}', media_type="application/json")
+_READY = Response(content=b'{"status":"ready"}', media_type="application/json")
+
+
 @router.get("/health", response_model=HealthResponse)
-async def health_check() -> HealthResponse:
+async def health_check() -> Response:
     """Health check endpoint for Kubernetes."""
-    return HealthResponse(status="healthy")
+    return _HEALTHY
 
 
 @router.get("/health/live", response_model=HealthResponse)
-async def liveness() -> HealthResponse:
+async def liveness() -> Response:
     """Liveness probe - returns OK if service is running."""
-    return HealthResponse(status="ok")
+    return _LIVE
 
 
 @router.get("/health/ready", response_model=HealthResponse)
-async def readiness() -> HealthResponse:
+async def readiness() -> Response:
     """Readiness probe - returns OK if service is ready to accept traffic."""
-    return HealthResponse(status="ready")
+    return _READY
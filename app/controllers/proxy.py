@@ -1,30 +1,23 @@
-from fastapi import APIRouter, Request, Depends
-from fastapi.responses import Response
-from dependency_injector.wiring import inject, Provide
+from starlette.requests import Request
+from starlette.responses import Response
 
-from app.container import Container
 from app.services.proxy import ProxyService
 
-router = APIRouter(tags=["Proxy"])
+# Methods forwarded by the catch-all route
+PROXY_METHODS = ["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"]
 
 
-@router.api_route(
-    "/{path:path}",
-    methods=["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"],
-)
-@inject
-async def proxy_all(
-    request: Request,
-    path: str,
-    proxy_service: ProxyService = Depends(Provide[Container.proxy_service]),
-) -> Response:
+async def proxy_all(request: Request) -> Response:
     """
     Proxy all requests to Prowlarr.
     
     This endpoint catches all paths and methods, forwarding them to the 
     configured Prowlarr instance. Search results are automatically 
     transformed using LLM to extract structured metadata.
+
+    Registered as a plain Starlette route (see create_app) so requests skip
+    FastAPI's dependency and response_model handling.
     """
+    # Singleton resolved once at startup (see lifespan) to skip DI lookup per request
+    proxy_service: ProxyService = request.app.state.proxy_service
     return await proxy_service.proxy_request(request)
-
-
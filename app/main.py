@@ -1,14 +1,19 @@
 import structlog
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
+from app.config import settings
 from app.container import Container, shutdown_services
-from app.controllers import proxy_router, health_router
+from app.controllers import proxy_all, PROXY_METHODS, health_router
 
 
 def configure_logging() -> None:
     """Configure structured logging."""
+    # Filtering logger turns below-level calls into no-ops before the processor
+    # chain runs, so per-item debug logs on hot paths cost almost nothing
     structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(settings.min_log_level),
         processors=[
             structlog.contextvars.merge_contextvars,
             structlog.processors.add_log_level,
@@ -29,6 +34,7 @@ async def lifespan(app: FastAPI):
     # Initialize DI container
     container = Container()
     app.state.container = container
+    app.state.proxy_service = container.proxy_service()
     
     logger.info("Application started successfully")
     
@@ -52,14 +58,20 @@ def create_app() -> FastAPI:
         ),
         version="0.1.0",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
     
     # Include routers
     # Health routes first (without proxy catch-all)
     app.include_router(health_router)
     
-    # Proxy catch-all last
-    app.include_router(proxy_router)
+    # Proxy catch-all last, as a bare Starlette route
+    app.add_route(
+        "/{path:path}",
+        proxy_all,
+        methods=PROXY_METHODS,
+        include_in_schema=False,
+    )
     
     return app
 
@@ -70,9 +82,12 @@ app = create_app()
 
 if __name__ == "__main__":
     import uvicorn
+
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
-        port=8080,
-        reload=True,
+        port=settings.port,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,  # requests are already logged by ProxyService
     )
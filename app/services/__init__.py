@@ -1,4 +1,5 @@
+from app.services.cache import DiskCache
 from app.services.llm import LLMService
 from app.services.proxy import ProxyService
 
-__all__ = ["LLMService", "ProxyService"]
+__all__ = ["DiskCache", "LLMService", "ProxyService"]
@@ -0,0 +1,53 @@
+import os
+import sqlite3
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+# Max seconds a write waits for another process holding the lock
+BUSY_TIMEOUT = 0.1
+
+
+class DiskCache:
+    """Persistent SQLite-backed key/value store for parsed titles.
+
+    The file can be shared by several worker processes: WAL readers never
+    block, and a contended write gives up after BUSY_TIMEOUT (callers log
+    and skip it) rather than stalling the event loop.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(
+            path, timeout=BUSY_TIMEOUT, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA mmap_size=268435456")
+        # Keys are fixed-size binary digests
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries (key BLOB PRIMARY KEY, value TEXT NOT NULL) "
+            "WITHOUT ROWID"
+        )
+        logger.info("DiskCache opened", path=path)
+
+    def get(self, key: bytes) -> str | None:
+        """Return cached value or None."""
+        row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: bytes, value: str) -> None:
+        """Insert or replace a cached value."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO entries (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    def clear(self) -> None:
+        """Remove all cached values."""
+        self._conn.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
@@ -0,0 +1,203 @@
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.services.llm import TorrentItem
+
+# Titles already in a Sonarr-parseable scene layout (ASCII names only):
+# "Show Name S01E02 1080p ...", "Show.Name.S01E01-E03.720p...", "Movie (2020) 1080p ..."
+CLEAN_TV_RE = re.compile(
+    r"^[\w.\- ]+?[ .]S\d{2}E\d{2}(?:-?E\d{2})?[ .](?:2160p|1080p|720p|480p)\b",
+    re.ASCII | re.IGNORECASE,
+)
+CLEAN_MOVIE_RE = re.compile(
+    r"^[\w.\- ]+?[ .]\((?:19|20)\d{2}\)[ .](?:2160p|1080p|720p|480p)\b",
+    re.ASCII | re.IGNORECASE,
+)
+
+# Episode info: "[12 из 12]", "[1-13 из 24]", "[E1 of 13]"
+EP_RE = re.compile(r"\[E?(\d+)(?:\s*[-–]\s*E?(\d+))?\s+(?:из|of)\s+(\d+)\]", re.IGNORECASE)
+RES_RE = re.compile(r"\b(2160p|1080p|720p|480p)\b", re.IGNORECASE)
+SRC_RE = re.compile(
+    r"\b(WEB-DL|WEBRip|WEB-DLRip|BDRemux|BD\s?Remux|BDRip|Blu-?ray|HDTVRip|HDTV|DVDRip)\b",
+    re.IGNORECASE,
+)
+
+# Language tags
+JAP_RE = re.compile(r"\bJAP\b", re.IGNORECASE)
+RUS_RE = re.compile(r"\bRUS\b", re.IGNORECASE)
+ENG_RE = re.compile(r"\bENG\b", re.IGNORECASE)
+SUB_RE = re.compile(r"\+\s*Sub\b", re.IGNORECASE)
+# "Sub" without a leading "+" ("[JAP, Sub]") doesn't say whose subtitles they are
+BARE_SUB_RE = re.compile(r"(?:^|[^+\s])\s*\bSub\b", re.IGNORECASE)
+
+# Language flag Prowlarr appends after the last bracket group
+RUS_SUFFIX_RE = re.compile(r"(?<=[\])])\s*RUS\s*$", re.IGNORECASE)
+
+# Season markers in the torrent title: "(ТВ-2)", "[TV-2]", "(S2)", "2nd Season",
+# "Season 2", "2 сезон", "сезон 2"
+TITLE_SEASON_RE = re.compile(
+    r"[\[(](?:ТВ|TV|S)-?\s*(\d+)[\])]"
+    r"|\b(\d+)(?:st|nd|rd|th)\s+Season\b|\bSeason\s+(\d+)\b"
+    r"|\b(\d+)(?:-?й)?\s+сезон|\bсезон\s+(\d+)\b",
+    re.IGNORECASE,
+)
+
+# Season suffix in the Sonarr series name: "Golden Kamuy 2nd Season", "Show S2"
+SERIES_SEASON_RE = re.compile(
+    r"\s+(?:(\d+)(?:st|nd|rd|th)\s+Season|Season\s+(\d+)|S(\d+)|Part\s+(\d+))\s*$",
+    re.IGNORECASE,
+)
+
+# Bare numbers, Roman numerals and unnumbered season words outside brackets make
+# the season ambiguous ("Золотое божество 2 / ...", "Overlord IV", "The Final Season")
+BRACKETS_RE = re.compile(r"\[[^\]]*\]|\([^)]*\)")
+BARE_NUMBER_RE = re.compile(r"\b\d+\b")
+ROMAN_NUMERAL_RE = re.compile(r"\b(?:II|III|IV|V|VI|VII|VIII|IX|X)\b")
+SEASON_WORD_RE = re.compile(r"\bSeason\b|\bсезон|\bPart\b", re.IGNORECASE)
+
+# Numbers a bracket group may hold besides the season marker and episode range;
+# any other number ("[Part 2]", "[Cour 2]") could be a season we don't recognise
+YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+KNOWN_NUMBER_RES = (TITLE_SEASON_RE, EP_RE, RES_RE, YEAR_RE)
+DIGIT_RE = re.compile(r"\d")
+
+
+def _first_group(match: re.Match[str]) -> int:
+    """Return the first non-empty numeric group of a match."""
+    return int(next(g for g in match.groups() if g))
+
+
+def _quality(title: str) -> tuple[str, bool] | None:
+    """Return (quality, is_remux) or None if the source is unknown."""
+    src_match = SRC_RE.search(title)
+    if not src_match:
+        return None
+
+    res_match = RES_RE.search(title)
+    resolution = res_match.group(1).lower() if res_match else "1080p"
+    source = src_match.group(1).upper().replace(" ", "").replace("-", "")
+
+    if "REMUX" in source:
+        return f"Bluray.{resolution}.Remux", True
+    if source.startswith("WEB"):
+        return f"WEBDL-{resolution}", False
+    if source in ("BDRIP", "BLURAY"):
+        return f"Bluray-{resolution}", False
+    if source.startswith("HDTV"):
+        return f"HDTV-{resolution}", False
+    if source == "DVDRIP":
+        return "DVD", False
+    return None
+
+
+def _languages(title: str) -> str:
+    """Build language tags; on RuTracker "+Sub" means Russian subtitles."""
+    title = RUS_SUFFIX_RE.sub("", title)
+    tags = ""
+    if JAP_RE.search(title):
+        tags += "[JA]"
+    if RUS_RE.search(title) or SUB_RE.search(title):
+        tags += "[RU]"
+    if ENG_RE.search(title):
+        tags += "[EN]"
+    return tags
+
+
+def _episodes(title: str) -> str | None:
+    """Return episode part ("E01-E12") for unambiguous ranges, else None."""
+    match = EP_RE.search(title)
+    if not match:
+        return None
+
+    first, last, total = int(match.group(1)), match.group(2), int(match.group(3))
+    if last is not None:
+        return f"E{first:02d}-E{int(last):02d}"
+    if first == total:
+        # Full season
+        return f"E01-E{total:02d}"
+    # "[5 из 12]" is ambiguous (episode 5 vs. episodes 1-5) - leave it to the LLM
+    return None
+
+
+def _unknown_bracket_number(title: str) -> bool:
+    """True if a bracket group holds a number that isn't season, episodes, resolution or year."""
+    for match in BRACKETS_RE.finditer(title):
+        group = match.group()
+        for pattern in KNOWN_NUMBER_RES:
+            group = pattern.sub("", group)
+        if DIGIT_RE.search(group):
+            return True
+    return False
+
+
+def _ambiguous_season(title: str) -> bool:
+    """True if the title hints at a season outside brackets that we can't read."""
+    outside = BRACKETS_RE.sub("", title)
+    return bool(
+        BARE_NUMBER_RE.search(outside)
+        or ROMAN_NUMERAL_RE.search(outside)
+        or SEASON_WORD_RE.search(outside)
+    )
+
+
+def is_clean(title: str) -> bool:
+    """True if Sonarr already parses the title as-is (scene layout)."""
+    return bool(CLEAN_TV_RE.match(title) or CLEAN_MOVIE_RE.match(title))
+
+
+def fast_parse(item: "TorrentItem") -> str | None:
+    """
+    Parse common RuTracker title layouts without calling the LLM.
+
+    Returns the normalized title, or None when the title doesn't match
+    the known patterns confidently enough.
+    """
+    title = item.title
+
+    if not item.series_name:
+        return None
+
+    episodes = _episodes(title)
+    if episodes is None:
+        return None
+
+    quality = _quality(title)
+    if quality is None:
+        return None
+
+    if BARE_SUB_RE.search(title):
+        return None
+
+    languages = _languages(title)
+    if not languages:
+        return None
+
+    # Series name without its season suffix
+    name = item.series_name.strip()
+    season: int | None = None
+    series_season = SERIES_SEASON_RE.search(name)
+    if series_season:
+        season = _first_group(series_season)
+        name = name[:series_season.start()].strip()
+
+    # Anything that might be a season we can't read goes to the LLM rather
+    # than being cached as a confident S01
+    if _unknown_bracket_number(title):
+        return None
+
+    title_season = TITLE_SEASON_RE.search(title)
+    if title_season:
+        season = _first_group(title_season)
+    elif season is None:
+        if _ambiguous_season(title):
+            return None
+        season = 1
+
+    if not name:
+        return None
+
+    quality_str, is_remux = quality
+    if is_remux:
+        return f"{name} - S{season:02d}{episodes} - {quality_str} {languages}"
+    return f"{name} - S{season:02d}{episodes} - [{quality_str}]{languages}"
@@ -1,168 +1,594 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+from collections import OrderedDict
+from typing import Any
+
+import httpx
+import orjson
 from openai import AsyncOpenAI
 import structlog
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from app.services.cache import DiskCache
+from app.services.fast_parser import fast_parse, is_clean
+from app.services.prompts import BATCH_INSTRUCTION, SINGLE_INSTRUCTION, SYSTEM_PROMPT
 
 logger = structlog.get_logger()
 
-SYSTEM_PROMPT = """Parse torrent title for Sonarr. Output ONLY the normalized title.
-
-RULE #1 - NAME (MOST IMPORTANT):
-The "Series:" field contains the base name Sonarr expects. Use it BUT:
-- REMOVE season indicators from the name: "S2", "2nd Season", "Season 2", "Part 2", etc.
-- Put the season number in the S{season} field instead
-Example: Series: "Golden Kamuy 2nd Season" → "Golden Kamuy - S02"
-Example: Series: "Attack on Titan" → "Attack on Titan"
-IGNORE all other names in the title (Russian, Japanese, romanji) - use ONLY Series field!
-
-RULE #2 - LANGUAGES (IMPORTANT - check carefully!):
-On RuTracker, "+Sub" ALWAYS means Russian subtitles!
-- "JAP+Sub" or "[JAP+Sub]" → [JA][RU] (Japanese audio + Russian subs)
-- "JAP+RUS" → [JA][RU]
-- "JAP" alone (no +Sub, no +RUS) → [JA]
-- "RUS" or "RUS(ext)" → [RU]
-- "ENG" → [EN]
-
-RULE #3 - SEASON (extract from TITLE, not Series field!):
-- "(S1)" or "(ТВ-1)" or "[TV]" or "1st Season" → S01
-- "(S2)" or "(ТВ-2)" or "2nd Season" or "2" after title → S02
-- "(S3)" or "(ТВ-3)" or "3rd Season" or "3" after title → S03
-- "(S4)", "(S5)", etc. → S04, S05, etc.
-
-RULE #4 - EPISODES:
-- "[12 из 12]" or "[E12 of 12]" → E01-E12 (FULL season, range from 1 to the number!)
-- "[1-13 из 24]" → E01-E13 (partial season)
-- "[E1 of 13]" → E01 (single episode, ongoing series)
-- "[1123-1155]" (absolute numbers, no "из/of") → 1123-1155 (no S/E prefix)
-
-RULE #5 - QUALITY (ALWAYS include resolution!):
-- WEB-DL 1080p / WEBRip 1080p → [WEBDL-1080p]
-- WEB-DL 720p / WEBRip 720p → [WEBDL-720p]
-- WEB-DL 2160p / 4K → [WEBDL-2160p]
-- BDRip 1080p / Blu-ray 1080p → [Bluray-1080p]
-- BDRip 720p → [Bluray-720p]
-- BDRemux / BD Remux 1080p → Bluray.1080p.Remux (NO brackets!)
-- BDRemux 2160p / 4K Remux → Bluray.2160p.Remux (NO brackets!)
-- HDTV 1080p → [HDTV-1080p]
-- HDTV 720p → [HDTV-720p]
-- DVDRip → [DVD]
-- If resolution unknown, assume 1080p
-
-FORMAT: {Series Title} - S{season}E{episode}-E{episode} - [Quality][Language]
-For Remux: {Series Title} - S{season} - Bluray.1080p.Remux [Language]
-
-EXAMPLES:
-
-Title: "Тодзима / Toujima Tanzaburou wa Kamen Rider ni Naritai [1-13 из 24] [RUS(ext), JAP+Sub] [WEB-DL 1080p]"
-Series: Tojima Wants to Be a Kamen Rider
-→ Tojima Wants to Be a Kamen Rider - S01E01-E13 - [WEBDL-1080p][JA][RU]
-
-Title: "Атака титанов (ТВ-1) / Shingeki no Kyojin [25 из 25] [JAP+Sub] [BDRip 1080p]"
-Series: Attack on Titan
-→ Attack on Titan - S01E01-E25 - [Bluray-1080p][JA][RU]
-
-Title: "Ван-Пис / One Piece [1123-1155] WEB-DL 1080p JAP+SUB"
-Series: One Piece
-→ One Piece - 1123-1155 - [WEBDL-1080p][JA][RU]
-
-Title: "Наруто / Naruto [TV] [720p] [JAP+RUS]"
-Series: Naruto
-→ Naruto - S01 - [HDTV-720p][JA][RU]
-
-Title: "Атака титанов / Shingeki no Kyojin [25 из 25] [BDRemux] [JAP+RUS]"
-Series: Attack on Titan
-→ Attack on Titan - S01E01-E25 - Bluray.1080p.Remux [JA][RU]
-
-Title: "Золотое божество 2 / Golden Kamuy 2nd Season [12 из 12] [WEB-DL 1080p] [JAP+Sub]"
-Series: Golden Kamuy 2nd Season
-→ Golden Kamuy - S02E01-E12 - [WEBDL-1080p][JA][RU]"""
-
-
-@dataclass
+# Max titles packed into a single LLM request
+BATCH_SIZE = 10
+
+# Seconds a partial batch waits for titles from concurrent requests before dispatch
+BATCH_WAIT = 0.01
+
+# Chunks read after the JSON object completes while waiting for the usage chunk
+USAGE_WAIT_CHUNKS = 4
+
+# JSON mode: the client returns a single JSON object we decode once
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+# Identical for every request; only serialized, never mutated
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
+
+@dataclass(slots=True, frozen=True)
 class TorrentItem:
     """Data extracted from a Torznab item."""
     title: str
-    category: str = ""
     series_name: str = ""  # Expected name from Sonarr search query
-    
+    _prompt: str = field(init=False, repr=False, compare=False)
+    # Compact fixed-size int key for the in-memory caches, hashed from the prompt
+    cache_key: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Build the prompt and its cache key once; frozen + slots rules out
+        # cached_property. Whitespace is collapsed so trivially different items
+        # share a cache key.
+        prompt = (
+            f"Title: {' '.join(self.title.split())}"
+            + (f"\nSeries: {' '.join(self.series_name.split())}" if self.series_name else "")
+        )
+        object.__setattr__(self, "_prompt", prompt)
+        # Keying on the prompt (not just the title) keeps results for the same
+        # title searched under different series names apart
+        digest = hashlib.blake2b(prompt.encode(), digest_size=8).digest()
+        object.__setattr__(self, "cache_key", int.from_bytes(digest, "big"))
+
     def to_prompt(self) -> str:
         """Format item data for LLM prompt."""
-        parts = [f"Title: {self.title}"]
-        if self.series_name:
-            parts.append(f"Series: {self.series_name}")
-        if self.category:
-            parts.append(f"Category: {self.category}")
-        return "\n".join(parts)
+        return self._prompt
 
 
 class LLMService:
     """Service for parsing torrent titles using OpenAI."""
 
-    def __init__(self, api_key: str, model: str = "gpt-4o-mini"):
-        self._client = AsyncOpenAI(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gpt-4o-mini",
+        cache_size: int = 10_000,
+        cache_dir: str = "",
+        max_concurrency: int = 50,
+    ):
+        # Keep-alive + HTTP/2 so concurrent chunks share connections instead of
+        # paying TCP/TLS handshakes per burst
+        self._client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            ),
+        )
+        # Caps in-flight requests so bursts don't pile into OpenAI rate limits
+        self._semaphore = asyncio.Semaphore(max_concurrency)
         self._model = model
-        self._cache: dict[str, str] = {}
-        logger.info("LLMService initialized", model=model)
+        # Disk keys hash "<model>|<prompt>"; the model prefix is absorbed once
+        self._disk_key_base = hashlib.blake2b(f"{model}|".encode(), digest_size=16)
+        self._cache: OrderedDict[int, str] = OrderedDict()
+        self._cache_max = cache_size
+
+        # Titles currently being parsed, so concurrent callers share one LLM call
+        self._inflight: dict[int, asyncio.Future[str]] = {}
+
+        # Items waiting to be packed into the next LLM batch, shared by all
+        # callers so concurrent searches fill batches together
+        self._queue: list[tuple[TorrentItem, asyncio.Future[str]]] = []
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._batch_tasks: set[asyncio.Task[None]] = set()
+        self._closed = False
+
+        # Optional persistent cache so parsed titles survive restarts
+        self._disk_cache: DiskCache | None = None
+        if cache_dir:
+            try:
+                self._disk_cache = DiskCache(os.path.join(cache_dir, "titles.sqlite3"))
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("Disk cache unavailable", cache_dir=cache_dir, error=str(e))
+
+        logger.info(
+            "LLMService initialized",
+            model=model,
+            cache_size=cache_size,
+            disk_cache=self._disk_cache is not None,
+        )
+
+    def _disk_key(self, item: TorrentItem) -> bytes:
+        """Persistent key includes the model so switching models invalidates entries.
+
+        Stored as a raw 16-byte digest to keep the database compact.
+        """
+        hasher = self._disk_key_base.copy()
+        hasher.update(item.to_prompt().encode())
+        return hasher.digest()
+
+    def _cache_get(self, item: TorrentItem) -> str | None:
+        """Look up a cached result (memory, then disk), marking it as recently used."""
+        key = item.cache_key
+        normalized = self._cache.get(key)
+        if normalized is not None:
+            self._cache.move_to_end(key)
+            return normalized
+
+        if self._disk_cache is not None:
+            try:
+                normalized = self._disk_cache.get(self._disk_key(item))
+            except sqlite3.Error as e:
+                logger.warning("Disk cache read failed", error=str(e))
+                return None
+            if normalized is not None:
+                self._memory_put(key, normalized)
+
+        return normalized
+
+    def _memory_put(self, key: int, normalized: str) -> None:
+        """Store in memory LRU, evicting the least recently used entry when full."""
+        self._cache[key] = normalized
+        self._cache.move_to_end(key)
+        if len(self._cache) > self._cache_max:
+            self._cache.popitem(last=False)
+
+    def _cache_put(self, item: TorrentItem, normalized: str) -> None:
+        """Store a result in memory and, if enabled, on disk."""
+        self._memory_put(item.cache_key, normalized)
+
+        if self._disk_cache is not None:
+            try:
+                self._disk_cache.set(self._disk_key(item), normalized)
+            except sqlite3.Error as e:
+                logger.warning("Disk cache write failed", error=str(e))
+
+    def _finalize(self, item: TorrentItem, normalized: str) -> str:
+        """Apply post-processing to an LLM result and cache it."""
+        # Add [RUS] suffix if original title ends with RUS (from Prowlarr)
+        # (rstrip only walks trailing whitespace; upper() on 3 chars, not the whole title)
+        if item.title.rstrip()[-3:].upper() == "RUS":
+            normalized = f"{normalized}[RUS]"
+
+        # Cache the result
+        self._cache_put(item, normalized)
+
+        logger.debug(
+            "Title parsed",
+            raw=item.title[:80],
+            normalized=normalized,
+        )
+
+        return normalized
+
+    def _completion_params(self, user_prompt: str, max_tokens: int) -> dict[str, Any]:
+        """Chat completion parameters shared by live and Batch API requests."""
+        return {
+            "model": self._model,
+            "messages": [SYSTEM_MESSAGE, {"role": "user", "content": user_prompt}],
+            "max_tokens": max_tokens,
+            "temperature": 0.1,  # Low temperature for consistent output
+            "response_format": JSON_RESPONSE_FORMAT,
+        }
+
+    def _log_usage(self, response: Any) -> None:
+        """Log token usage, including prompt tokens served from OpenAI's prompt cache."""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        logger.debug(
+            "LLM usage",
+            prompt_tokens=usage.prompt_tokens,
+            cached_prompt_tokens=getattr(details, "cached_tokens", None),
+            completion_tokens=usage.completion_tokens,
+        )
 
     async def parse_item(self, item: TorrentItem) -> str:
         """
         Parse a torrent item into Sonarr-compatible format.
         Returns the normalized title.
         """
-        # Check cache first (key is just the title)
-        if item.title in self._cache:
+        # Already clean - returned untouched, nothing to cache
+        if is_clean(item.title):
+            return item.title
+
+        # Check cache (keyed by the full prompt)
+        cached = self._cache_get(item)
+        if cached is not None:
             logger.debug("Cache hit for title", raw_title=item.title[:50])
-            return self._cache[item.title]
+            return cached
+
+        # Common title layouts don't need the LLM
+        fast = fast_parse(item)
+        if fast is not None:
+            return self._finalize(item, fast)
 
+        # Join an identical request that is already in flight
+        key = item.cache_key
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            logger.debug("Joining in-flight parse", raw_title=item.title[:50])
+            return await self._join_inflight(item, inflight)
+
+        return await asyncio.shield(self._submit(item))
+
+    async def parse_title(self, raw_title: str) -> str:
+        """Parse a bare title with no series context."""
+        return await self.parse_item(TorrentItem(title=raw_title))
+
+    async def _join_inflight(self, item: TorrentItem, future: asyncio.Future[str]) -> str:
+        """
+        Wait for another caller's parse of the same item.
+        If that parse was cancelled before finishing, parse it ourselves.
+        """
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            task = asyncio.current_task()
+            if not future.cancelled() or (task is not None and task.cancelling()):
+                raise
+        return await self.parse_item(item)
+
+    async def _complete_json(self, params: dict[str, Any]) -> dict[str, Any]:
+        """
+        Stream a JSON-mode completion and stop soon after the object is complete.
+
+        JSON mode can keep emitting whitespace after the closing brace until
+        max_tokens, so the stream is closed early. Only a few more chunks are
+        read once the object parses, so the usage chunk (sent right after
+        finish_reason) is still logged when the model stops cleanly.
+        """
+        parts: list[str] = []
+        result: dict[str, Any] | None = None
+        trailing = 0
+        async with self._semaphore:
+            stream = await self._client.chat.completions.create(
+                **params,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            try:
+                async for chunk in stream:
+                    if chunk.usage is not None:
+                        # Always the last chunk
+                        self._log_usage(chunk)
+                        break
+                    if result is not None:
+                        trailing += 1
+                        if trailing > USAGE_WAIT_CHUNKS:
+                            break
+                        continue
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if not delta:
+                        continue
+                    parts.append(delta)
+                    if "}" in delta:
+                        try:
+                            parsed = orjson.loads("".join(parts))
+                        except orjson.JSONDecodeError:
+                            continue  # brace inside a string or nested object
+                        if isinstance(parsed, dict):
+                            result = parsed
+            finally:
+                await stream.close()
+
+        if result is not None:
+            return result
+        parsed = orjson.loads("".join(parts))
+        if not isinstance(parsed, dict):
+            raise ValueError(f"Expected JSON object, got {type(parsed).__name__}")
+        return parsed
+
+    async def _parse_single(self, item: TorrentItem) -> str:
+        """Parse one item with its own LLM request, bypassing cache and coalescing."""
         try:
             # Build prompt with all available info
-            user_prompt = item.to_prompt()
+            user_prompt = f"{item.to_prompt()}\n\n{SINGLE_INSTRUCTION}"
             
-            response = await self._client.chat.completions.create(
-                model=self._model,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": user_prompt},
-                ],
-                max_tokens=150,
-                temperature=0.1,  # Low temperature for consistent output
+            result = await self._complete_json(
+                self._completion_params(user_prompt, max_tokens=150)
             )
-
-            normalized = response.choices[0].message.content.strip()
+            normalized = result["title"]
+            if not isinstance(normalized, str):
+                raise ValueError(f"Expected string title, got {type(normalized).__name__}")
+            normalized = normalized.strip()
             
             # Basic validation - should not be empty
             if not normalized:
                 logger.warning("LLM returned empty title", raw_title=item.title[:50])
                 return item.title
 
-            # Add [RUS] suffix if original title ends with RUS (from Prowlarr)
-            if item.title.rstrip().upper().endswith("RUS"):
-                normalized = f"{normalized}[RUS]"
-
-            # Cache the result
-            self._cache[item.title] = normalized
-            
-            logger.info(
-                "Title parsed",
-                raw=item.title[:80],
-                normalized=normalized,
-            )
-            
-            return normalized
+            return self._finalize(item, normalized)
 
         except Exception as e:
             logger.error("Failed to parse title with LLM", error=str(e), raw_title=item.title[:50])
             return item.title
 
+    async def _parse_chunk(self, items: list[TorrentItem]) -> list[str]:
+        """
+        Parse a chunk of items with a single numbered LLM request.
+        Items the response doesn't cover are retried with individual calls.
+        """
+        if len(items) == 1:
+            return [await self._parse_single(items[0])]
+
+        user_prompt = "\n\n".join(
+            f"{i}. {item.to_prompt()}" for i, item in enumerate(items, start=1)
+        )
+
+        try:
+            result = await self._complete_json(
+                self._completion_params(
+                    f"{user_prompt}\n\n{BATCH_INSTRUCTION}", max_tokens=150 * len(items)
+                )
+            )
+
+            # {"titles": {"1": "...", "2": "..."}} - keyed by item number
+            titles = result["titles"]
+            parsed = {
+                i: title.strip()
+                for i in range(1, len(items) + 1)
+                if isinstance(title := titles.get(str(i)), str) and title.strip()
+            }
+
+        except Exception as e:
+            logger.warning(
+                "Batch parse failed, falling back to individual calls",
+                error=str(e),
+                batch_size=len(items),
+            )
+            return list(await asyncio.gather(*(self._parse_single(item) for item in items)))
+
+        missing = [i for i in range(1, len(items) + 1) if i not in parsed]
+        if missing:
+            logger.warning(
+                "Batch response incomplete, retrying missing items individually",
+                missing=len(missing),
+                batch_size=len(items),
+            )
+            retried = await asyncio.gather(*(self._parse_single(items[i - 1]) for i in missing))
+            resolved = dict(zip(missing, retried))
+        else:
+            resolved = {}
+
+        return [
+            resolved[i] if i in resolved else self._finalize(item, parsed[i])
+            for i, item in enumerate(items, start=1)
+        ]
+
     async def parse_items_batch(self, items: list[TorrentItem]) -> list[str]:
         """
-        Parse multiple torrent items in parallel.
+        Parse multiple torrent items, packing up to BATCH_SIZE titles per LLM request.
+        Titles from concurrent calls share batches (see `_enqueue`).
         """
-        import asyncio
-        tasks = [self.parse_item(item) for item in items]
-        return await asyncio.gather(*tasks)
+        # Collapse identical items (same cache key) so each is looked up and
+        # parsed once, then scatter the results back to every position
+        unique_index: dict[int, int] = {}
+        unique: list[TorrentItem] = []
+        positions: list[int] = []
+        for item in items:
+            index = unique_index.setdefault(item.cache_key, len(unique))
+            if index == len(unique):
+                unique.append(item)
+            positions.append(index)
+
+        unique_results = await self._parse_unique(unique)
+        return [unique_results[index] for index in positions]
+
+    async def _parse_unique(self, items: list[TorrentItem]) -> list[str]:
+        """Parse deduplicated items: clean titles, cache, fast path, in-flight joins, then LLM."""
+        results: list[str | None] = [None] * len(items)
+        pending: list[tuple[int, asyncio.Future[str]]] = []
+        waiting: list[tuple[int, asyncio.Future[str]]] = []
+
+        # Pass clean titles through, serve cache hits directly, join titles
+        # already in flight elsewhere, only send the rest to LLM
+        for i, item in enumerate(items):
+            if is_clean(item.title):
+                results[i] = item.title
+                continue
+
+            cached = self._cache_get(item)
+            if cached is not None:
+                results[i] = cached
+                continue
+
+            fast = fast_parse(item)
+            if fast is not None:
+                results[i] = self._finalize(item, fast)
+                continue
+
+            inflight = self._inflight.get(item.cache_key)
+            if inflight is not None:
+                waiting.append((i, inflight))
+                continue
+
+            pending.append((i, self._submit(item)))
+
+        normalized_titles = await asyncio.gather(*(asyncio.shield(future) for _, future in pending))
+        for (i, _), normalized in zip(pending, normalized_titles):
+            results[i] = normalized
+
+        for i, inflight in waiting:
+            results[i] = await self._join_inflight(items[i], inflight)
+
+        return results  # type: ignore[return-value]
+
+    def _submit(self, item: TorrentItem) -> asyncio.Future[str]:
+        """
+        Register an in-flight parse of the item and queue it for batching.
+        The future belongs to the batch, not the caller: a caller that gives up
+        (awaiting it shielded) doesn't take the result away from callers that joined it.
+        """
+        if self._closed:
+            raise RuntimeError("LLMService is closed")
+
+        key = item.cache_key
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+
+        def _done(_: asyncio.Future[str]) -> None:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        future.add_done_callback(_done)
+        self._enqueue(item, future)
+        return future
+
+    def _enqueue(self, item: TorrentItem, future: asyncio.Future[str]) -> None:
+        """
+        Queue an item for the next LLM batch.
+        A full batch is dispatched at once; a partial one after BATCH_WAIT,
+        so titles from concurrent requests can fill it.
+        """
+        self._queue.append((item, future))
+        if len(self._queue) >= BATCH_SIZE:
+            self._flush_queue()
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.get_running_loop().call_later(BATCH_WAIT, self._flush_queue)
+
+    def _flush_queue(self) -> None:
+        """Dispatch queued items in BATCH_SIZE chunks, skipping already-resolved futures."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        queued = [entry for entry in self._queue if not entry[1].done()]
+        self._queue = []
+        for i in range(0, len(queued), BATCH_SIZE):
+            task = asyncio.create_task(self._run_batch(queued[i:i + BATCH_SIZE]))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch: list[tuple[TorrentItem, asyncio.Future[str]]]) -> None:
+        """Parse one batch and resolve each caller's future."""
+        try:
+            normalized_titles = await self._parse_chunk([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), normalized in zip(batch, normalized_titles):
+                if not future.done():
+                    future.set_result(normalized)
+        finally:
+            # Cancelled by close(): don't leave callers waiting forever
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+
+    async def parse_items_batch_offline(
+        self, items: list[TorrentItem], poll_interval: float = 30.0
+    ) -> list[str]:
+        """
+        Parse items through the OpenAI Batch API (half the token price,
+        results within the 24h completion window).
+
+        For non-interactive flows only - this polls until the batch finishes.
+        Items that fail or are missing from the output keep their raw title.
+        """
+        results: list[str | None] = []
+        for item in items:
+            if is_clean(item.title):
+                results.append(item.title)
+                continue
+            result = self._cache_get(item)
+            if result is None and (fast := fast_parse(item)) is not None:
+                result = self._finalize(item, fast)
+            results.append(result)
+        pending = [i for i, result in enumerate(results) if result is None]
+
+        if pending:
+            lines = [
+                orjson.dumps({
+                    "custom_id": str(i),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._completion_params(
+                        f"{items[i].to_prompt()}\n\n{SINGLE_INSTRUCTION}", max_tokens=150
+                    ),
+                })
+                for i in pending
+            ]
+            batch_file = await self._client.files.create(
+                file=("titles.jsonl", b"\n".join(lines)),
+                purpose="batch",
+            )
+            batch = await self._client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+            logger.info("LLM batch submitted", batch_id=batch.id, items=len(pending))
+
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                await asyncio.sleep(poll_interval)
+                batch = await self._client.batches.retrieve(batch.id)
+
+            logger.info("LLM batch finished", batch_id=batch.id, status=batch.status)
+
+            if batch.output_file_id:
+                output = await self._client.files.content(batch.output_file_id)
+                pending_set = set(pending)
+                for line in output.content.splitlines():
+                    try:
+                        record = orjson.loads(line)
+                        i = int(record["custom_id"])
+                        body = record["response"]["body"]
+                        title = orjson.loads(body["choices"][0]["message"]["content"])["title"]
+                    except (
+                        orjson.JSONDecodeError, KeyError, IndexError, TypeError, ValueError
+                    ) as e:
+                        logger.warning("Skipping malformed batch result", error=str(e))
+                        continue
+                    if i in pending_set and isinstance(title, str) and title.strip():
+                        results[i] = self._finalize(items[i], title.strip())
+
+        return [
+            result if result is not None else item.title
+            for item, result in zip(items, results)
+        ]
 
     def clear_cache(self) -> None:
         """Clear the title cache."""
         self._cache.clear()
+        if self._disk_cache is not None:
+            self._disk_cache.clear()
         logger.info("LLM cache cleared")
 
+    async def close(self) -> None:
+        """Cancel queued batches, close the OpenAI client and the persistent cache."""
+        self._closed = True
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        for _, future in self._queue:
+            future.cancel()
+        self._queue = []
+        for task in self._batch_tasks:
+            task.cancel()
+        await self._client.close()
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+            self._disk_cache = None
+
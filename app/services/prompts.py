@@ -0,0 +1,78 @@
+# Prompts are plain constants and never formatted per call: OpenAI caches the
+# prompt prefix, so the system message must stay byte-identical across requests.
+# Examples are kept to the cases the rules alone don't make obvious; every
+# example is re-billed as input tokens on each uncached call.
+
+SYSTEM_PROMPT = """\
+Parse torrent titles for Sonarr. Respond ONLY with JSON, in the shape the user message asks for.
+
+RULE #1 - NAME (MOST IMPORTANT):
+The "Series:" field contains the base name Sonarr expects. Use it BUT:
+- REMOVE season indicators from the name: "S2", "2nd Season", "Season 2", "Part 2", etc.
+- Put the season number in the S{season} field instead
+Example: Series: "Golden Kamuy 2nd Season" → "Golden Kamuy - S02"
+Example: Series: "Attack on Titan" → "Attack on Titan"
+IGNORE all other names in the title (Russian, Japanese, romanji) - use ONLY Series field!
+
+RULE #2 - LANGUAGES (IMPORTANT - check carefully!):
+On RuTracker, "+Sub" ALWAYS means Russian subtitles!
+- "JAP+Sub" or "[JAP+Sub]" → [JA][RU] (Japanese audio + Russian subs)
+- "JAP+RUS" → [JA][RU]
+- "JAP" alone (no +Sub, no +RUS) → [JA]
+- "RUS" or "RUS(ext)" → [RU]
+- "ENG" → [EN]
+
+RULE #3 - SEASON (extract from TITLE, not Series field!):
+- "(S1)" or "(ТВ-1)" or "[TV]" or "1st Season" → S01
+- "(S2)" or "(ТВ-2)" or "2nd Season" or "2" after title → S02
+- "(S3)" or "(ТВ-3)" or "3rd Season" or "3" after title → S03
+- "(S4)", "(S5)", etc. → S04, S05, etc.
+
+RULE #4 - EPISODES:
+- "[12 из 12]" or "[E12 of 12]" → E01-E12 (FULL season, range from 1 to the number!)
+- "[1-13 из 24]" → E01-E13 (partial season)
+- "[E1 of 13]" → E01 (single episode, ongoing series)
+- "[1123-1155]" (absolute numbers, no "из/of") → 1123-1155 (no S/E prefix)
+
+RULE #5 - QUALITY (ALWAYS include resolution!):
+- WEB-DL 1080p / WEBRip 1080p → [WEBDL-1080p]
+- WEB-DL 720p / WEBRip 720p → [WEBDL-720p]
+- WEB-DL 2160p / 4K → [WEBDL-2160p]
+- BDRip 1080p / Blu-ray 1080p → [Bluray-1080p]
+- BDRip 720p → [Bluray-720p]
+- BDRemux / BD Remux 1080p → Bluray.1080p.Remux (NO brackets!)
+- BDRemux 2160p / 4K Remux → Bluray.2160p.Remux (NO brackets!)
+- HDTV 1080p → [HDTV-1080p]
+- HDTV 720p → [HDTV-720p]
+- DVDRip → [DVD]
+- If resolution unknown, assume 1080p
+
+FORMAT: {Series Title} - S{season}E{episode}-E{episode} - [Quality][Language]
+For Remux: {Series Title} - S{season}E{episode}-E{episode} - Bluray.1080p.Remux [Language]
+
+EXAMPLES:
+
+Title: "Золотое божество 2 / Golden Kamuy 2nd Season [12 из 12] [WEB-DL 1080p] [JAP+Sub]"
+Series: Golden Kamuy 2nd Season
+→ Golden Kamuy - S02E01-E12 - [WEBDL-1080p][JA][RU]
+
+Title: "Ван-Пис / One Piece [1123-1155] WEB-DL 1080p JAP+SUB"
+Series: One Piece
+→ One Piece - 1123-1155 - [WEBDL-1080p][JA][RU]
+
+Title: "Наруто / Naruto [TV] [720p] [JAP+RUS]"
+Series: Naruto
+→ Naruto - S01 - [HDTV-720p][JA][RU]"""
+
+# The output schema lives only in the user message, so one system prompt serves
+# both single-item and batch requests
+
+# Instruction appended after a single item's prompt
+SINGLE_INSTRUCTION = 'Respond ONLY with JSON: {"title": "<normalized title>"}'
+
+# Instruction appended after the numbered items in batch prompts
+BATCH_INSTRUCTION = (
+    "Parse each numbered item independently. "
+    "Respond ONLY with JSON mapping each item number to its normalized title: "
+    '{"titles": {"1": "...", "2": "..."}}'
+)
@@ -1,9 +1,17 @@
-import re
+import html
+import logging
+import random
+import time
+import zlib
+from collections.abc import AsyncIterator, Callable
 from typing import TYPE_CHECKING
 
+import brotli
 import httpx
 import structlog
 from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
 if TYPE_CHECKING:
     from app.services.llm import LLMService
@@ -15,10 +23,114 @@ logger = structlog.get_logger()
 # Torznab search endpoints that return torrent results
 TORZNAB_SEARCH_PARAMS = {"t": ["search", "tvsearch", "movie", "music", "book"]}
 
-# Regex patterns for extracting data from XML items
-ITEM_PATTERN = re.compile(r"<item>(.*?)</item>", re.DOTALL)
-TITLE_TAG_PATTERN = re.compile(r"<title>(.*?)</title>", re.DOTALL)
-CATEGORY_PATTERN = re.compile(r'<category>(\d+)</category>', re.DOTALL)
+# MIME types of Torznab result feeds whose titles get rewritten
+XML_CONTENT_TYPES = frozenset({
+    "application/xml",
+    "text/xml",
+    "application/rss+xml",
+    "application/atom+xml",
+})
+
+# Tags located with plain bytes.find scans over the raw feed (linear, no regex
+# backtracking, no decode of the whole document)
+ITEM_OPEN, ITEM_CLOSE = b"<item>", b"</item>"
+TITLE_OPEN, TITLE_CLOSE = b"<title>", b"</title>"
+
+# Canned error responses, pre-encoded like the health probes
+_NO_UPSTREAM = Response(
+    content=b'{"error": "No upstream configured"}', status_code=503, media_type="application/json"
+)
+_UPSTREAM_TIMEOUT = Response(
+    content=b'{"error": "Upstream timeout"}', status_code=504, media_type="application/json"
+)
+_PROXY_ERROR = Response(
+    content=b'{"error": "Proxy error"}', status_code=502, media_type="application/json"
+)
+
+# XML escaping for rewritten titles, applied in a single C-level pass
+XML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+# Bytes of a streamed response body kept for the log preview
+PREVIEW_BYTES = 2000
+
+# Hop-by-hop headers (RFC 9110 7.6.1) describe a single connection and are never
+# forwarded; "host" is replaced by httpx with the upstream's
+_HOP_BY_HOP = frozenset({
+    b"host",
+    b"connection",
+    b"keep-alive",
+    b"proxy-authenticate",
+    b"proxy-authorization",
+    b"te",
+    b"trailers",
+    b"transfer-encoding",
+    b"upgrade",
+})
+
+# Upstream response headers dropped when relaying as-is / after rewriting the body
+STREAM_DROP_HEADERS = _HOP_BY_HOP
+REWRITE_DROP_HEADERS = _HOP_BY_HOP | {b"content-encoding", b"content-length"}
+
+
+def _zlib_decoder() -> Callable[[bytes, int], bytes]:
+    # wbits | 32 auto-detects gzip and zlib headers
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)
+    return decompressor.decompress
+
+
+def _brotli_decoder() -> Callable[[bytes, int], bytes]:
+    decompressor = brotli.Decompressor()
+    return lambda data, limit: decompressor.process(data, output_buffer_limit=limit)
+
+
+# Incremental decoders for the log preview, producing at most `limit` bytes per
+# call, so the cost stays O(preview) instead of O(body). Built lazily per response.
+PREVIEW_DECODERS: dict[str, Callable[[], Callable[[bytes, int], bytes]]] = {
+    "gzip": _zlib_decoder,
+    "deflate": _zlib_decoder,
+    "br": _brotli_decoder,
+}
+
+
+def _find_items(xml_content: bytes) -> list[tuple[int, int]]:
+    """Spans of the content between each <item> and its closing </item>."""
+    spans: list[tuple[int, int]] = []
+    pos = 0
+    while (start := xml_content.find(ITEM_OPEN, pos)) != -1:
+        start += len(ITEM_OPEN)
+        end = xml_content.find(ITEM_CLOSE, start)
+        if end == -1:
+            break
+        spans.append((start, end))
+        pos = end + len(ITEM_CLOSE)
+    return spans
+
+
+def _find_title(xml_content: bytes, start: int, end: int) -> tuple[int, int] | None:
+    """Span of the <title> text within [start, end), or None."""
+    title_start = xml_content.find(TITLE_OPEN, start, end)
+    if title_start == -1:
+        return None
+    title_start += len(TITLE_OPEN)
+    title_end = xml_content.find(TITLE_CLOSE, title_start, end)
+    if title_end == -1:
+        return None
+    return title_start, title_end
+
+
+def _mime_type(content_type: str) -> str:
+    """MIME type of a Content-Type header, without parameters."""
+    return content_type.partition(";")[0].strip().lower()
+
+
+def _relay_headers(response: httpx.Response, drop: frozenset[bytes]) -> list[tuple[bytes, bytes]]:
+    """Upstream headers as raw ASGI pairs, keeping repeated headers like set-cookie."""
+    relayed = []
+    for name, value in response.headers.raw:
+        name = name.lower()
+        if name not in drop:
+            relayed.append((name, value))
+    return relayed
 
 
 class ProxyService:
@@ -28,14 +140,34 @@ class ProxyService:
         self,
         routes: dict[int, str],
         timeout: float,
+        max_connections: int = 200,
+        max_keepalive: int = 100,
+        keepalive_expiry: float = 60.0,
         llm_service: "LLMService | None" = None,
         llm_enabled: bool = True,
+        log_level: int = logging.INFO,
+        log_sample_rate: float = 1.0,
     ):
         self._routes = {int(k): v.rstrip("/") for k, v in routes.items()}
+        # Unknown ports fall back to the first route
+        self._fallback_upstream = next(iter(self._routes.values()), None)
         self._timeout = timeout
-        self._client = httpx.AsyncClient(timeout=timeout)
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
         self._llm_service = llm_service
         self._llm_enabled = llm_enabled and llm_service is not None
+        # Log payloads (previews, bodies) are only built if they'd be emitted
+        self._info_enabled = log_level <= logging.INFO
+        self._debug_enabled = log_level <= logging.DEBUG
+        # Share of requests whose payloads are logged at DEBUG
+        self._sample_rate = log_sample_rate
 
         logger.info(
             "ProxyService initialized",
@@ -55,13 +187,7 @@ class ProxyService:
             except ValueError:
                 pass
 
-        upstream = self._routes.get(port)
-
-        # Fallback to first route if port not found
-        if not upstream and self._routes:
-            upstream = next(iter(self._routes.values()))
-
-        return upstream
+        return self._routes.get(port) or self._fallback_upstream
 
     def _is_torznab_search(self, request: Request) -> bool:
         """Check if request is a Torznab search request."""
@@ -69,110 +195,121 @@ class ProxyService:
         if "/api" not in request.url.path:
             return False
 
-        query_params = dict(request.query_params)
-        t_param = query_params.get("t", "")
+        return request.query_params.get("t", "") in TORZNAB_SEARCH_PARAMS["t"]
 
-        return t_param in TORZNAB_SEARCH_PARAMS["t"]
+    def _extract_item_data(
+        self, xml_content: bytes, item_span: tuple[int, int], series_name: str = ""
+    ) -> tuple[TorrentItem, tuple[int, int] | None]:
+        """Extract the title from an XML item, plus the title text span.
 
-    def _extract_item_data(self, item_xml: str, series_name: str = "") -> TorrentItem:
-        """Extract title and category from an XML item."""
-        title_match = TITLE_TAG_PATTERN.search(item_xml)
-        category_match = CATEGORY_PATTERN.search(item_xml)
-        return TorrentItem(
-            title=title_match.group(1) if title_match else "",
-            category=category_match.group(1) if category_match else "",
-            series_name=series_name,
-        )
+        The search runs in place within the item's bounds (no per-item substring),
+        and the returned absolute span lets the rewrite skip a second search.
+        """
+        start, end = item_span
+        title_span = _find_title(xml_content, start, end)
+        # Only the title is decoded. Entities are unescaped so the LLM sees
+        # (and is billed for) plain text; the rewritten title is escaped again
+        title = ""
+        if title_span:
+            title = html.unescape(
+                xml_content[title_span[0]:title_span[1]].decode("utf-8", errors="replace")
+            )
+        return TorrentItem(title=title, series_name=series_name), title_span
 
-    async def _process_torznab_response(self, xml_content: str, series_name: str = "") -> str:
+    async def _process_torznab_response(
+        self, xml_content: bytes, series_name: str = ""
+    ) -> bytes | None:
         """Process Torznab XML response and normalize titles using LLM.
         
-        Extracts title, description, and category for better LLM context.
-        Uses regex to preserve original XML structure - only replaces title text.
+        Extracts each item's title (entities unescaped) and sends it to the LLM
+        together with the series name.
+        Splices titles into the raw bytes to preserve original XML structure -
+        only title text is replaced.
         
         Args:
-            xml_content: The XML response from Prowlarr
+            xml_content: The raw (UTF-8) XML response body from Prowlarr
             series_name: The series name from Sonarr's search query (q parameter)
+
+        Returns:
+            The rewritten XML, or None if no title changed (callers reuse the original).
         """
         if not self._llm_service:
-            return xml_content
+            return None
 
         try:
-            # Find all <item>...</item> blocks
-            item_matches = list(ITEM_PATTERN.finditer(xml_content))
+            # Locate all <item>...</item> blocks
+            item_spans = _find_items(xml_content)
 
-            if not item_matches:
+            if not item_spans:
                 logger.debug("No items found in Torznab response")
-                return xml_content
+                return None
 
-            logger.info(f"Processing {len(item_matches)} torrent items", series_name=series_name or "unknown")
+            logger.info(
+                f"Processing {len(item_spans)} torrent items",
+                series_name=series_name or "unknown",
+            )
 
             # Extract data from all items
             torrent_items: list[TorrentItem] = []
-            for match in item_matches:
-                item_data = self._extract_item_data(match.group(1), series_name=series_name)
+            title_spans: list[tuple[int, int] | None] = []
+            for item_span in item_spans:
+                item_data, title_span = self._extract_item_data(
+                    xml_content, item_span, series_name=series_name
+                )
                 torrent_items.append(item_data)
+                title_spans.append(title_span)
 
             # Process all items through LLM
             normalized_titles = await self._llm_service.parse_items_batch(torrent_items)
 
-            # Build replacement map - we need to replace titles within items
-            result = xml_content
-            offset = 0
-            
-            for match, item_data, normalized_title in zip(item_matches, torrent_items, normalized_titles):
-                if not item_data.title or normalized_title == item_data.title:
+            # Rebuild the document in one linear pass: untouched slices and
+            # replaced titles are collected in order and joined once
+            parts: list[bytes] = []
+            pos = 0
+
+            for title_span, item_data, normalized_title in zip(
+                title_spans, torrent_items, normalized_titles
+            ):
+                if title_span is None or not item_data.title or normalized_title == item_data.title:
                     continue
 
-                # Find the title tag within this item
-                item_start = match.start() + offset
-                item_content = match.group(1)
-                title_match = TITLE_TAG_PATTERN.search(item_content)
-                
-                if title_match:
-                    # Calculate absolute position of title content
-                    title_content_start = item_start + len("<item>") + title_match.start(1)
-                    title_content_end = item_start + len("<item>") + title_match.end(1)
-                    
-                    # Escape XML special characters
-                    safe_title = (
-                        normalized_title
-                        .replace("&", "&amp;")
-                        .replace("<", "&lt;")
-                        .replace(">", "&gt;")
-                    )
-                    
-                    # Replace title
-                    result = result[:title_content_start] + safe_title + result[title_content_end:]
-                    
-                    # Update offset for next iteration
-                    offset += len(safe_title) - len(item_data.title)
-                    
-                    logger.debug(
-                        "Title normalized",
-                        original=item_data.title[:50],
-                        normalized=normalized_title,
-                    )
+                title_start, title_end = title_span
+                parts.append(xml_content[pos:title_start])
+                parts.append(normalized_title.translate(XML_ESCAPE).encode("utf-8"))
+                pos = title_end
+
+                logger.debug(
+                    "Title normalized",
+                    original=item_data.title[:50],
+                    normalized=normalized_title,
+                )
 
-            return result
+            if not parts:
+                return None
+
+            parts.append(xml_content[pos:])
+            return b"".join(parts)
 
         except Exception as e:
             logger.error("Failed to process Torznab response", error=str(e))
-            return xml_content
+            return None
+
+    def _sample_verbose(self) -> bool:
+        """Whether this request gets DEBUG request/payload logging."""
+        if not self._debug_enabled:
+            return False
+        return self._sample_rate >= 1.0 or random.random() < self._sample_rate
 
     async def proxy_request(self, request: Request) -> Response:
         """
         Proxy a request to upstream with full logging.
         Optionally processes Torznab responses through LLM.
         """
+        started = time.perf_counter()
         upstream_url = self._get_upstream_url(request)
 
         if not upstream_url:
-            return Response(
-                content='{"error": "No upstream configured"}',
-                status_code=503,
-                media_type="application/json",
-            )
+            return _NO_UPSTREAM
 
         path = request.url.path
         query_string = request.url.query
@@ -184,79 +321,177 @@ class ProxyService:
         # Check if this is a Torznab search request
         is_search = self._is_torznab_search(request)
 
-        # Prepare headers - pass everything through as-is
-        headers = dict(request.headers)
-        headers.pop("host", None)
-
-        # Get request body
-        body = await request.body()
+        # Prepare headers - end-to-end headers pass through as-is (raw ASGI pairs)
+        headers: list[tuple[bytes, bytes]] = []
+        content_length: int | None = 0
+        for name, value in request.headers.raw:
+            if name in _HOP_BY_HOP:
+                if name == b"transfer-encoding":
+                    # Chunked upload, length unknown; httpx frames the body itself
+                    content_length = None
+                continue
+            if name == b"content-length":
+                content_length = int(value)
+            headers.append((name, value))
+
+        # Request bodies are streamed upstream as they arrive and only buffered
+        # when DEBUG logging prints them; requests without one send none
+        verbose = self._sample_verbose()
+        content: bytes | AsyncIterator[bytes] | None = None
+        body: bytes | None = None
+        if content_length != 0:
+            if verbose:
+                content = body = await request.body()
+            else:
+                content = request.stream()
 
-        # Log request
-        logger.info(
-            ">>> REQUEST",
-            method=request.method,
-            path=path,
-            query=query_string or None,
-            upstream=upstream_url,
-            is_torznab_search=is_search,
-            body=body.decode("utf-8") if body else None,
-        )
+        if verbose:
+            logger.debug(
+                ">>> REQUEST",
+                method=request.method,
+                path=path,
+                query=query_string or None,
+                upstream=upstream_url,
+                is_torznab_search=is_search,
+                body_length=content_length,
+                body=body.decode("utf-8", errors="replace") if body else None,
+            )
 
         try:
-            response = await self._client.request(
+            upstream_request = self._client.build_request(
                 method=request.method,
                 url=target_url,
                 headers=headers,
-                content=body,
+                content=content,
             )
+            response = await self._client.send(upstream_request, stream=True)
 
-            response_body = response.content.decode("utf-8", errors="replace")
-
-            # Process Torznab search responses through LLM
-            if is_search and self._llm_enabled and "xml" in response.headers.get("content-type", ""):
-                # Extract series name from search query (q parameter)
-                from urllib.parse import unquote
-                series_name = unquote(request.query_params.get("q", ""))
-                logger.info("Processing Torznab search response through LLM", series_name=series_name)
-                response_body = await self._process_torznab_response(response_body, series_name=series_name)
-                response_content = response_body.encode("utf-8")
-            else:
-                response_content = response.content
-
-            logger.info(
-                "<<< RESPONSE",
-                status_code=response.status_code,
-                body_preview=response_body[:2000] if len(response_body) > 2000 else response_body,
-                body_length=len(response_body),
-                processed_by_llm=is_search and self._llm_enabled,
+            # Only Torznab search results need the full body; everything else streams through
+            should_process = (
+                is_search
+                and self._llm_enabled
+                and _mime_type(response.headers.get("content-type", "")) in XML_CONTENT_TYPES
             )
+            if not should_process:
+                return self._stream_response(response, request.method, path, started, verbose)
 
-            # Remove compression headers since httpx already decompressed
-            response_headers = dict(response.headers)
-            response_headers.pop("content-encoding", None)
-            response_headers.pop("transfer-encoding", None)
-            response_headers["content-length"] = str(len(response_content))
+            try:
+                await response.aread()
+            finally:
+                await response.aclose()
 
-            return Response(
-                content=response_content,
-                status_code=response.status_code,
-                headers=response_headers,
+            # Process Torznab search responses through LLM
+            # Extract series name from search query (q parameter)
+            from urllib.parse import unquote
+            series_name = unquote(request.query_params.get("q", ""))
+            logger.debug("Processing Torznab search response through LLM", series_name=series_name)
+            # The feed stays bytes throughout; nothing changed means the upstream
+            # body is sent as-is
+            rewritten = await self._process_torznab_response(
+                response.content, series_name=series_name
             )
+            response_content = response.content if rewritten is None else rewritten
+
+            if self._info_enabled:
+                logger.info(
+                    "<<< RESPONSE",
+                    method=request.method,
+                    path=path,
+                    status_code=response.status_code,
+                    body_length=len(response_content),
+                    duration_ms=round((time.perf_counter() - started) * 1000, 1),
+                    processed_by_llm=True,
+                    titles_rewritten=rewritten is not None,
+                )
+            if verbose:
+                logger.debug(
+                    "<<< RESPONSE BODY",
+                    path=path,
+                    body_preview=response_content[:PREVIEW_BYTES].decode("utf-8", errors="replace"),
+                )
+
+            # Response sets content-length; compression headers are dropped
+            # since httpx already decompressed
+            proxied = Response(content=response_content, status_code=response.status_code)
+            proxied.raw_headers.extend(_relay_headers(response, REWRITE_DROP_HEADERS))
+            return proxied
 
         except httpx.TimeoutException:
             logger.error("Request to upstream timed out", path=path)
-            return Response(
-                content='{"error": "Upstream timeout"}',
-                status_code=504,
-                media_type="application/json",
-            )
+            return _UPSTREAM_TIMEOUT
         except Exception as e:
             logger.error("Proxy request failed", path=path, error=str(e))
-            return Response(
-                content='{"error": "Proxy error"}',
-                status_code=502,
-                media_type="application/json",
+            return _PROXY_ERROR
+
+    def _stream_response(
+        self, response: httpx.Response, method: str, path: str, started: float, verbose: bool
+    ) -> StreamingResponse:
+        """Relay an upstream response as-is, logging it once the stream completes.
+
+        With `verbose`, a bounded prefix of the body is kept for a DEBUG preview.
+        """
+        # Raw (still encoded) bytes are forwarded, so content-encoding and
+        # content-length stay valid
+        headers = _relay_headers(response, STREAM_DROP_HEADERS)
+
+        if not self._info_enabled:
+            streamed = StreamingResponse(
+                response.aiter_raw(),
+                status_code=response.status_code,
+                background=BackgroundTask(response.aclose),
             )
+            streamed.raw_headers.extend(headers)
+            return streamed
+
+        content_encoding = response.headers.get("content-encoding")
+        encoding = content_encoding.lower() if content_encoding else "identity"
+        encoded = encoding != "identity"
+        new_decoder = PREVIEW_DECODERS.get(encoding) if encoded else None
+        preview = bytearray()
+        preview_limit = PREVIEW_BYTES if verbose else 0
+
+        async def body() -> AsyncIterator[bytes]:
+            nonlocal new_decoder
+            decode: Callable[[bytes, int], bytes] | None = None
+            body_length = 0
+            try:
+                async for chunk in response.aiter_raw():
+                    body_length += len(chunk)
+                    remaining = preview_limit - len(preview)
+                    if remaining > 0:
+                        if not encoded:
+                            preview.extend(chunk[:remaining])
+                        elif new_decoder is not None:
+                            try:
+                                if decode is None:
+                                    decode = new_decoder()
+                                preview.extend(decode(chunk, remaining)[:remaining])
+                            except Exception:
+                                # Undecodable preview must not break the relay
+                                new_decoder = None
+                    yield chunk
+            finally:
+                await response.aclose()
+                logger.info(
+                    "<<< RESPONSE",
+                    method=method,
+                    path=path,
+                    status_code=response.status_code,
+                    body_length=body_length,
+                    duration_ms=round((time.perf_counter() - started) * 1000, 1),
+                    processed_by_llm=False,
+                )
+                if preview:
+                    logger.debug(
+                        "<<< RESPONSE BODY",
+                        path=path,
+                        content_encoding=content_encoding,
+                        body_preview=preview.decode("utf-8", errors="replace"),
+                    )
+
+        streamed = StreamingResponse(body(), status_code=response.status_code)
+        streamed.raw_headers.extend(headers)
+        return streamed
 
     async def close(self) -> None:
         """Close HTTP client."""
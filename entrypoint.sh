@@ -4,10 +4,13 @@ set -e
 # Parse ROUTES JSON and start uvicorn for each port
 # Example ROUTES: {"8585": "http://sonarr:8989", "8586": "http://prowlarr:9696"}
 
+# uvloop event loop + httptools parser; access log off (ProxyService logs requests)
+UVICORN_OPTS="--loop uvloop --http httptools --no-access-log"
+
 if [ -z "$ROUTES" ]; then
     # Single port mode
     echo "Starting single instance on port ${PORT:-8080}"
-    exec uvicorn app.main:app --host 0.0.0.0 --port "${PORT:-8080}"
+    exec uvicorn app.main:app --host 0.0.0.0 --port "${PORT:-8080}" $UVICORN_OPTS
 else
     # Multi-port mode: extract ports from ROUTES JSON
     PORTS=$(echo "$ROUTES" | python3 -c "import sys, json; print(' '.join(json.load(sys.stdin).keys()))")
@@ -18,7 +21,7 @@ else
     PIDS=""
     for PORT in $PORTS; do
         echo "Starting on port $PORT..."
-        uvicorn app.main:app --host 0.0.0.0 --port "$PORT" &
+        uvicorn app.main:app --host 0.0.0.0 --port "$PORT" $UVICORN_OPTS &
         PIDS="$PIDS $!"
     done
     
@@ -0,0 +1,115 @@
+import pytest
+
+from app.services.fast_parser import fast_parse, is_clean
+from app.services.llm import TorrentItem
+
+JJK = "Магическая битва / Jujutsu Kaisen"
+TAGS = "[JAP+Sub] [WEB-DL 1080p]"
+
+
+@pytest.mark.parametrize(
+    ("title", "series_name", "expected"),
+    [
+        # Full season, season 1 implied
+        (
+            f"{JJK} [24 из 24] {TAGS}",
+            "Jujutsu Kaisen",
+            "Jujutsu Kaisen - S01E01-E24 - [WEBDL-1080p][JA][RU]",
+        ),
+        # Partial season, year inside a bracket group
+        (
+            f"{JJK} [1-13 из 24] [JAP+Sub] [2020, WEB-DL 1080p]",
+            "Jujutsu Kaisen",
+            "Jujutsu Kaisen - S01E01-E13 - [WEBDL-1080p][JA][RU]",
+        ),
+        # Season markers in round brackets, square brackets and in Russian
+        (
+            f"{JJK} (ТВ-2) [23 из 23] {TAGS}",
+            "Jujutsu Kaisen",
+            "Jujutsu Kaisen - S02E01-E23 - [WEBDL-1080p][JA][RU]",
+        ),
+        (
+            f"{JJK} [ТВ-2] [23 из 23] {TAGS}",
+            "Jujutsu Kaisen",
+            "Jujutsu Kaisen - S02E01-E23 - [WEBDL-1080p][JA][RU]",
+        ),
+        (
+            f"{JJK} [TV-2] [23 из 23] {TAGS}",
+            "Jujutsu Kaisen",
+            "Jujutsu Kaisen - S02E01-E23 - [WEBDL-1080p][JA][RU]",
+        ),
+        (
+            f"{JJK} (2 сезон) [23 из 23] {TAGS}",
+            "Jujutsu Kaisen",
+            "Jujutsu Kaisen - S02E01-E23 - [WEBDL-1080p][JA][RU]",
+        ),
+        # Season suffix taken from the Sonarr series name
+        (
+            "Золотое божество / Golden Kamuy [12 из 12] [JAP+Sub] [BDRip 1080p]",
+            "Golden Kamuy 2nd Season",
+            "Golden Kamuy - S02E01-E12 - [Bluray-1080p][JA][RU]",
+        ),
+        # "+ Sub" with spaces is still Russian subtitles
+        (
+            f"{JJK} [24 из 24] [JAP + Sub] [WEB-DL 1080p]",
+            "Jujutsu Kaisen",
+            "Jujutsu Kaisen - S01E01-E24 - [WEBDL-1080p][JA][RU]",
+        ),
+        # Remux keeps the quality outside brackets
+        (
+            f"{JJK} [24 из 24] [JAP+Sub] [BDRemux 1080p]",
+            "Jujutsu Kaisen",
+            "Jujutsu Kaisen - S01E01-E24 - Bluray.1080p.Remux [JA][RU]",
+        ),
+    ],
+)
+def test_fast_parse(title: str, series_name: str, expected: str) -> None:
+    assert fast_parse(TorrentItem(title=title, series_name=series_name)) == expected
+
+
+@pytest.mark.parametrize(
+    ("title", "series_name"),
+    [
+        # Season can't be read reliably
+        ("Оверлорд / Overlord IV [13 из 13] [JAP+Sub] [WEB-DL 1080p]", "Overlord"),
+        (
+            "Атака титанов / Attack on Titan The Final Season [16 из 16] [JAP+Sub] [WEB-DL 1080p]",
+            "Attack on Titan",
+        ),
+        ("Золотое божество 2 / Golden Kamuy 2 [12 из 12] [JAP+Sub] [BDRip 1080p]", "Golden Kamuy"),
+        (f"{JJK} [Part 2] [12 из 12] {TAGS}", "Jujutsu Kaisen"),
+        # "[5 из 12]" may be episode 5 or episodes 1-5
+        (f"{JJK} [5 из 24] {TAGS}", "Jujutsu Kaisen"),
+        # Subtitles without "+" may not be Russian
+        (
+            "Монолог фармацевта / Kusuriya no Hitorigoto [24 из 24] [JAP, Sub] [WEB-DL 1080p]",
+            "Kusuriya no Hitorigoto",
+        ),
+        # Unknown source, no language tags, no series name
+        (f"{JJK} [24 из 24] [JAP+Sub] [Rip 1080p]", "Jujutsu Kaisen"),
+        (f"{JJK} [24 из 24] [WEB-DL 1080p]", "Jujutsu Kaisen"),
+        (f"{JJK} [24 из 24] {TAGS}", ""),
+    ],
+)
+def test_fast_parse_defers_to_llm(title: str, series_name: str) -> None:
+    assert fast_parse(TorrentItem(title=title, series_name=series_name)) is None
+
+
+@pytest.mark.parametrize(
+    ("title", "expected"),
+    [
+        ("Show Name S01E02 1080p WEB-DL", True),
+        ("Show.Name.S01E01-E03.720p.WEBRip", True),
+        ("Show.Name.S01E01.1080p.WEB-DL RUS", True),
+        ("Movie Name (2020) 1080p BluRay", True),
+        (f"{JJK} [24 из 24] {TAGS}", False),
+        ("Show Name S01E02 WEB-DL", False),
+        # A year only counts in parentheses; bare numbers are season packs
+        ("Naruto 2002 720p BDRip", False),
+        ("Doctor Who 2005 1080p WEB-DL", False),
+        ("Show Name 1080 720p", False),
+        ("Movie Name (1080) 1080p BluRay", False),
+    ],
+)
+def test_is_clean(title: str, expected: bool) -> None:
+    assert is_clean(title) is expected